@@ -1,16 +1,35 @@
+from typing import Callable, Dict
 from utils import general
-from auth.authentication import hash_password
+from auth.authentication import hash_password, verify_password
 from auth.validation import validate_email, validate_password
 from cart.cart_management import view_cart, update_cart_item, remove_from_cart, clear_cart, checkout
+from products.product_management import search_products, handle_search_results
 import time
 
+_BANNER: str = '=' * 24
+_PURCHASE_HEADER: str = f"\n{_BANNER} Purchase Items {_BANNER}"
+_ACCOUNT_HEADER: str = f"\n{_BANNER} Manage Account {_BANNER}"
+_DASHBOARD_HEADER_FMT: str = "\n" + _BANNER + " Welcome, {} " + _BANNER
+
+_FUND_AMOUNTS: Dict[str, int] = {
+    '1': 10000,
+    '2': 20000,
+    '3': 50000,
+    '4': 100000,
+}
+_CUSTOM_AMOUNT_CHOICE: str = '5'
+_FUND_OPTIONS_TEXT: str = "\n".join(
+    [f"{key}. NGN {value:,.2f}" for key, value in _FUND_AMOUNTS.items()]
+    + [f"{_CUSTOM_AMOUNT_CHOICE}. Custom Amount"]
+)
+
 
 def verify_current_password() -> bool:
     """
-    Verify the current user's password by comparing hashed values.
+    Verify the current user's password against the stored hash.
 
-    Prompts user to enter their password and compares the hash
-    with the stored password hash.
+    Prompts user to enter their password and checks it with a
+    constant-time comparison against the stored password hash.
 
     Returns:
         bool: True if password is correct, False otherwise
@@ -20,7 +39,7 @@ def verify_current_password() -> bool:
     if not password:
         print("Password cannot be empty")
         return False
-    return hash_password(password) == general.current_user['password_hash']
+    return verify_password(password, general.current_user['password_hash'])
 
 
 def change_username() -> None:
@@ -44,18 +63,16 @@ def change_username() -> None:
         if not new_username.isalnum():
             print("Username must contain only letters and numbers")
             continue
-        for user in general.users:
-            if user['username'] == new_username:
-                print("Username already taken! ❌")
-                continue
+        if new_username in general.users_by_username:
+            print("Username already taken! ❌")
+            continue
         break
 
-    try:
-        general.current_user['username'] = new_username
-        general.save_users()
-        print("\nUsername updated successfully ✅")
-    except Exception as e:
-        print(f"Error saving username: {e}")
+    general.users_by_username.pop(general.current_user['username'], None)
+    general.current_user['username'] = new_username
+    general.users_by_username[new_username] = general.current_user
+    general.save_users()
+    print("\nUsername updated successfully ✅")
 
 
 def change_email() -> None:
@@ -75,20 +92,16 @@ def change_email() -> None:
             print("Email is not correct! 😒")
             continue
 
-        email_exists = False
-        for user in general.users:
-            if user['email'] == new_email:
-                print("Email already exist! ❌")
-                email_exists = True
-                break
-        if not email_exists:
-            break
-    try:
-        general.current_user['email'] = new_email
-        general.save_users()
-        print("\nEmail updated successfully! 📧")
-    except Exception as e:
-        print(f"Error saving email: {e}")
+        if new_email in general.users_by_email:
+            print("Email already exist! ❌")
+            continue
+        break
+
+    general.users_by_email.pop(general.current_user['email'], None)
+    general.current_user['email'] = new_email
+    general.users_by_email[new_email] = general.current_user
+    general.save_users()
+    print("\nEmail updated successfully! 📧")
 
 
 def change_password() -> None:
@@ -103,7 +116,7 @@ def change_password() -> None:
         print("Incorrect password")
         return
 
-    print("\nNew password must be at least 16 characters with:")
+    print("\nNew password must be at least 16 characters (at most 72 bytes) with:")
     print("- At least one uppercase letter")
     print("- At least one lowercase letter")
     print("- At least one number")
@@ -119,19 +132,16 @@ def change_password() -> None:
         if new_password != confirm_password:
             print("Passwords do not match")
             continue
-        if hash_password(new_password) == general.current_user['password_hash']:
+        if verify_password(new_password, general.current_user['password_hash']):
             print("New password cannot be the same as current password")
             continue
         break
 
     confirm = input("Are you sure you want to change your password? (y/n): ").strip().lower()
     if confirm == 'y':
-        try:
-            general.current_user['password_hash'] = hash_password(new_password)
-            general.save_users()
-            print("\nPassword changed successfully ✅")
-        except Exception as e:
-            print(f"Error saving password: {e}")
+        general.current_user['password_hash'] = hash_password(new_password)
+        general.save_users()
+        print("\nPassword changed successfully ✅")
     else:
         print("\nPassword change cancelled")
 
@@ -176,11 +186,8 @@ def reset_balance() -> None:
                 print("\nBalance reset cancelled")
                 return
         general.current_user['balance'] = 0.0
-        try:
-            general.save_users()
-            print("\nBalance reset to zero ✅")
-        except Exception as e:
-            print(f"Error saving balance reset: {e}")
+        general.save_users()
+        print("\nBalance reset to zero ✅")
     else:
         print("\nBalance reset cancelled")
 
@@ -209,16 +216,12 @@ def delete_account() -> bool:
         if confirm2 != 'DELETE':
             print("\nAccount deletion cancelled")
             return False
-        general.users.remove(general.current_user)
-        try:
-            general.save_users()
-            general.current_user = None
-            general.cart = []
-            print("\nAccount deleted successfully. Returning to main menu. 🗑️")
-            return True
-        except Exception as e:
-            print(f"Error deleting account: {e}")
-            return False
+        general.remove_user(general.current_user)
+        general.save_users()
+        general.current_user = None
+        general.cart = {}
+        print("\nAccount deleted successfully. Returning to main menu. 🗑️")
+        return True
     else:
         print("\nAccount deletion cancelled")
         return False
@@ -234,75 +237,62 @@ def fund_wallet() -> None:
     print("\n=== Fund Wallet ===")
     print(f"Current balance: NGN {general.current_user['balance']:,.2f}")
 
-    options = {
-        '1': 10000,
-        '2': 20000,
-        '3': 50000,
-        '4': 100000,
-        '5': "Custom Amount"
-    }
-
-    for key, value in options.items():
-        print(f"{key}. NGN {value:,.2f}" if isinstance(value, int) else f"{key}. {value}")
+    print(_FUND_OPTIONS_TEXT)
 
     while True:
         fund_choice: str = input("Select amount to add (1-5): ").strip()
-        if fund_choice in options:
-            if fund_choice == '5':
-                try:
-                    amount: float = float(input("Enter custom amount: "))
-                    if amount <= 0:
-                        print("Amount must be a positive number 😒")
-                        continue
-                    elif amount > 100000000:  # Example limit
-                        print("Maximum funding amount is NGN 100,000,000 at a time 🫤")
-                        continue
-                except ValueError:
-                    print("Invalid amount ❌")
+        if fund_choice == _CUSTOM_AMOUNT_CHOICE:
+            try:
+                amount: float = float(input("Enter custom amount: "))
+                if amount <= 0:
+                    print("Amount must be a positive number 😒")
                     continue
-            else:
-                amount = options[fund_choice]
-
-            general.current_user['balance'] += amount
-            general.save_users()
-            print(f"\nProcessing payment of NGN {amount:,.2f}...")
-            time.sleep(1)
-            print("Payment successful! ✅")
-            break
+                elif amount > 100000000:  # Example limit
+                    print("Maximum funding amount is NGN 100,000,000 at a time 🫤")
+                    continue
+            except ValueError:
+                print("Invalid amount ❌")
+                continue
+        elif fund_choice in _FUND_AMOUNTS:
+            amount = _FUND_AMOUNTS[fund_choice]
         else:
             print("Invalid Entry! 💢")
+            continue
 
+        general.current_user['balance'] += amount
+        general.save_users()
+        print(f"\nProcessing payment of NGN {amount:,.2f}...")
+        time.sleep(1)
+        print("Payment successful! ✅")
+        break
 
-def purchase_menu():
-    """
-    Main purchase menu interface.
 
-    Provides options for product search, cart management, checkout, and exit.
-    Continues until user chooses to exit.
-    """
-    while True:
-        print(f"\n{'===' * 8} Purchase Items {'===' * 8}")
-        print("1. Search Items")
-        print("2. Manage Cart")
-        print("3. Checkout")
-        print("4. Back to Store Menu")
-        purchase_choice: str = input("Enter choice (1-4): ").strip()
-        if purchase_choice == "1":
-            from products.product_management import search_products, handle_search_results
-            results = search_products()
-            if results:
-                handle_search_results(results)
-        elif purchase_choice == "2":
-            handle_cart_management()
-        elif purchase_choice == "3":
-            if general.cart:
-                checkout()
-            else:
-                print("Your cart is empty! Add items before checkout.")
-        elif purchase_choice == "4":
-            break
-        else:
-            print("Invalid choice! Please enter 1-4 💢")
+def _change_cart_quantity() -> None:
+    """Prompt for a cart item number and its new quantity"""
+    item_number: int | None = general.input_number("Enter item number to modify: ")
+    if item_number is None:
+        print("❌ Please enter a valid number")
+        return
+    new_quantity: int | None = general.input_number("Enter new quantity: ")
+    if new_quantity is None:
+        print("❌ Please enter a valid number")
+        return
+    update_cart_item(item_number - 1, new_quantity)
+
+
+def _remove_cart_item() -> None:
+    """Prompt for a cart item number and remove it"""
+    item_number: int | None = general.input_number("Enter item number to remove: ")
+    if item_number is None:
+        print("❌ Please enter a valid number")
+        return
+    remove_from_cart(item_number - 1)
+
+
+_CART_MENU_ACTIONS: Dict[str, Callable[[], None]] = {
+    '1': _change_cart_quantity,
+    '2': _remove_cart_item,
+}
 
 
 def handle_cart_management() -> None:
@@ -327,19 +317,9 @@ def handle_cart_management() -> None:
 
         user_choice: str = input("Enter choice (1-4): ").strip()
 
-        if user_choice == "1":
-            try:
-                item_id: int = int(input("Enter item number to modify: ")) - 1
-                new_quantity: int = int(input("Enter new quantity: "))
-                update_cart_item(item_id, new_quantity)
-            except ValueError:
-                print("❌ Please enter a valid number")
-        elif user_choice == "2":
-            try:
-                selected_item_index: int = int(input("Enter item number to remove: ")) - 1
-                remove_from_cart(selected_item_index)
-            except ValueError:
-                print("❌ Please enter a valid number")
+        action = _CART_MENU_ACTIONS.get(user_choice)
+        if action:
+            action()
         elif user_choice == "3":
             confirm = input("Are you sure you want to clear the cart? (y/n): ").lower()
             if confirm == 'y':
@@ -351,16 +331,77 @@ def handle_cart_management() -> None:
             print("Invalid choice")
 
 
+def _search_items() -> None:
+    """Search the inventory and let the user act on the results"""
+    results = search_products()
+    if results:
+        handle_search_results(results)
+
+
+def _checkout_cart() -> None:
+    """Check out the cart if it has items"""
+    if general.cart:
+        checkout()
+    else:
+        print("Your cart is empty! Add items before checkout.")
+
+
+_PURCHASE_MENU_ACTIONS: Dict[str, Callable[[], None]] = {
+    '1': _search_items,
+    '2': handle_cart_management,
+    '3': _checkout_cart,
+}
+
+
+def purchase_menu():
+    """
+    Main purchase menu interface.
+
+    Provides options for product search, cart management, checkout, and exit.
+    Continues until user chooses to exit.
+    """
+    while True:
+        print(_PURCHASE_HEADER)
+        print("1. Search Items")
+        print("2. Manage Cart")
+        print("3. Checkout")
+        print("4. Back to Store Menu")
+        purchase_choice: str = input("Enter choice (1-4): ").strip()
+        action = _PURCHASE_MENU_ACTIONS.get(purchase_choice)
+        if action:
+            action()
+        elif purchase_choice == "4":
+            break
+        else:
+            print("Invalid choice! Please enter 1-4 💢")
+
+
+_ACCOUNT_MENU_ACTIONS: Dict[str, Callable[[], None]] = {
+    '1': change_username,
+    '2': change_email,
+    '3': change_password,
+    '4': view_account_details,
+    '5': reset_balance,
+}
+
+
 def account_menu() -> None:
     """
     Handle account management menu operations.
 
     Provides options for users to modify account settings including username,
     email, password, view details, reset balance, and delete account.
-    Continues until user chooses to exit or account is deleted.
+    Continues until user chooses to exit or account is deleted. Changes made
+    in the menu are written to disk once, when the menu is left.
     """
+    with general.batched_saves():
+        _account_menu_loop()
+
+
+def _account_menu_loop() -> None:
+    """Run the account menu until the user goes back or deletes the account"""
     while True:
-        print(f"\n{'===' * 8} Manage Account {'===' * 8}")
+        print(_ACCOUNT_HEADER)
         print("1. Change Username")
         print("2. Change Email")
         print("3. Change Password")
@@ -369,16 +410,9 @@ def account_menu() -> None:
         print("6. Delete Account")
         print("7. Back to Store Menu")
         user_choice: str = input("Enter choice (1-7): ").strip()
-        if user_choice == '1':
-            change_username()
-        elif user_choice == '2':
-            change_email()
-        elif user_choice == '3':
-            change_password()
-        elif user_choice == '4':
-            view_account_details()
-        elif user_choice == "5":
-            reset_balance()
+        action = _ACCOUNT_MENU_ACTIONS.get(user_choice)
+        if action:
+            action()
         elif user_choice == "6":
             if delete_account():
                 return  # Return to main menu if account deleted
@@ -388,30 +422,33 @@ def account_menu() -> None:
             print("Invalid choice")
 
 
+_DASHBOARD_ACTIONS: Dict[str, Callable[[], None]] = {
+    '1': fund_wallet,
+    '2': purchase_menu,
+    '3': account_menu,
+}
+
+
 def dashboard():
     """
     A Function for the dashboard menu
     :return:
     """
-    from utils.general import clear_screen
     while True:
-        clear_screen()
-        print(f"\n{'===' * 8} Welcome, {general.current_user['username']} {'===' * 8}")
+        general.clear_screen()
+        print(_DASHBOARD_HEADER_FMT.format(general.current_user['username']))
         print("1. Fund Wallet")
         print("2. Purchase Items")
         print("3. Manage Account")
         print("4. Logout")
         dashboard_choice: str = input("Enter choice (1-4): ").strip()
 
-        if dashboard_choice == "1":
-            fund_wallet()
-        elif dashboard_choice == "2":
-            purchase_menu()
-        elif dashboard_choice == "3":
-            account_menu()
+        action = _DASHBOARD_ACTIONS.get(dashboard_choice)
+        if action:
+            action()
         elif dashboard_choice == "4":
             general.current_user = None
-            general.cart = []
+            general.cart = {}
             break
         else:
             print("Invalid choice")
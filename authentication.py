@@ -1,9 +1,19 @@
 import hashlib
-import random
+import hmac
+import secrets
 import string
-from typing import Dict, List
+import sys
+import time
+from typing import Callable, Dict, List
+import bcrypt
 from utils import general
-from auth.validation import validate_email, validate_password
+from auth.validation import PASSWORD_MAX_BYTES, validate_email, validate_password
+
+BCRYPT_ROUNDS: int = 12
+
+_PASSWORD_CHAR_GROUPS: tuple = (string.digits, string.ascii_lowercase, string.ascii_uppercase, string.punctuation)
+_ALL_PASSWORD_CHARS: str = ''.join(_PASSWORD_CHAR_GROUPS)
+_system_random = secrets.SystemRandom()
 
 
 def generate_password() -> str:
@@ -15,27 +25,50 @@ def generate_password() -> str:
     - At least one symbol
     Returns: str: Generated 16-character password
     """
-    numbers_pass_chars: str = string.digits
-    lower_pass_chars: str = string.ascii_lowercase
-    upper_pass_chars: str = string.ascii_uppercase
-    sym_pass_chars: str = string.punctuation
-
-    password: List = [
-        random.choice(numbers_pass_chars),
-        random.choice(lower_pass_chars),
-        random.choice(upper_pass_chars),
-        random.choice(sym_pass_chars)
-    ]
-    all_pass_chars: str = numbers_pass_chars + lower_pass_chars + upper_pass_chars + sym_pass_chars[0]
-    for _ in range(12):
-        password.append(random.choice(all_pass_chars))
-    random.shuffle(password)
+    password: List = [_system_random.choice(chars) for chars in _PASSWORD_CHAR_GROUPS]
+    password.extend(_system_random.choices(_ALL_PASSWORD_CHARS, k=12))
+    _system_random.shuffle(password)
     return ''.join(password)
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash a password using bcrypt with a per-password random salt"""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+
+def verify_password(password: str, stored_hash: str) -> bool:
+    """
+    Check a plain password against a stored hash in constant time.
+
+    Accounts created before the move to bcrypt still hold unsalted SHA-256
+    hex digests; those are compared with hmac.compare_digest.
+    :param password: str
+    :param stored_hash: str
+    :return: bool
+    """
+    if stored_hash.startswith('$2'):
+        try:
+            return bcrypt.checkpw(password.encode(), stored_hash.encode())
+        except ValueError:
+            return False
+    legacy_hash: str = hashlib.sha256(password.encode()).hexdigest()
+    return hmac.compare_digest(legacy_hash, stored_hash)
+
+
+def _upgrade_legacy_hash(user: Dict, password: str) -> None:
+    """
+    Replace a verified legacy SHA-256 hash with a bcrypt hash and save it.
+
+    Passwords over bcrypt's byte limit keep their legacy hash. A failed save
+    leaves the new hash in memory to be written by the next save.
+    """
+    if user['password_hash'].startswith('$2') or len(password.encode()) > PASSWORD_MAX_BYTES:
+        return
+    user['password_hash'] = hash_password(password)
+    try:
+        general.save_users()
+    except OSError as e:
+        print(f"Error saving upgraded password hash: {e}")
 
 
 def sign_in_user() -> bool:
@@ -47,22 +80,21 @@ def sign_in_user() -> bool:
 
     user_log_identity: str = input(f"Enter your Username / Email: ").strip()
     user_log_pass: str = input("Enter your password: ").strip()
-    hashed_input: str = hash_password(user_log_pass)
 
-    for user in general.users:
-        if (user['username'] == user_log_identity or user['email'] == user_log_identity):
-            if user['password_hash'] == hashed_input:
-                general.current_user = user
-                print("\nLogin successful! 😄")
-                return True
-            else:
-                print(f"\nDebug: Stored hash: {user['password_hash']}")
-                print(f"Debug: Input hash: {hashed_input}")
-                print("\nLogin failed! Invalid password. 😡")
-                return False
+    user: Dict | None = (general.users_by_username.get(user_log_identity)
+                         or general.users_by_email.get(user_log_identity))
+    if not user:
+        print("\nLogin failed! Username or email not found. 😡")
+        return False
 
-    print("\nLogin failed! Username or email not found. 😡")
-    return False
+    if verify_password(user_log_pass, user['password_hash']):
+        _upgrade_legacy_hash(user, user_log_pass)
+        general.current_user = user
+        print("\nLogin successful! 😄")
+        return True
+    else:
+        print("\nLogin failed! Invalid password. 😡")
+        return False
 
 
 def sign_up_user() -> bool:
@@ -84,10 +116,9 @@ def sign_up_user() -> bool:
         if not user_reg_username.isalnum():
             print("Username must contain only letters and numbers")
             continue
-        for user in general.users:
-            if user['username'] == user_reg_username:
-                print("Username already exist! ❌")
-                continue
+        if user_reg_username in general.users_by_username:
+            print("Username already exist! ❌")
+            continue
         break
 
     # Email handling
@@ -101,15 +132,10 @@ def sign_up_user() -> bool:
             print("Email is not correct! 😒")
             continue
 
-        email_exists = False
-        for user in general.users:
-            if user['email'] == user_reg_email:
-                print("Email already exist! ❌")
-                email_exists = True
-                break
-
-        if not email_exists:
-            break
+        if user_reg_email in general.users_by_email:
+            print("Email already exist! ❌")
+            continue
+        break
 
     # Password handling
     while True:
@@ -121,6 +147,7 @@ def sign_up_user() -> bool:
             break
         elif password_choice in ['n', 'no']:
             print("Password must be 16 characters long!")
+            print("Password must be at most 72 bytes (72 plain ASCII characters)")
             print("Password must contain an Uppercase letter")
             print("Password must contain a lowercase letter")
             print("Password must contain a number")
@@ -143,29 +170,37 @@ def sign_up_user() -> bool:
         'balance': 0
     }
 
-    general.users.append(new_user)
+    general.add_user(new_user)
     general.save_users()
     general.current_user = new_user
     print(f"Account created successfully for {user_reg_username}! ✅")
     return True
 
 
+def _exit_app() -> bool:
+    """Print a goodbye message and terminate the application"""
+    print("Thank you for using the app!\nShutting down...")
+    time.sleep(1)
+    sys.exit()
+
+
+_USER_CHOICE_HANDLERS: Dict[str, Callable[[], bool]] = {
+    '1': sign_in_user,
+    '2': sign_up_user,
+    '3': _exit_app,
+    'exit': _exit_app,
+    'quit': _exit_app,
+}
+
+
 def handle_user_choice(choice: str) -> bool:
     """
     Process user menu selection
     :param choice: str
     :return: bool
     """
-    if choice == '1':
-        return sign_in_user()
-    elif choice == '2':
-        return sign_up_user()
-    elif choice in ('3', 'exit', 'quit'):
-        print("Thank you for using the app!\nShutting down...")
-        import time
-        import sys
-        time.sleep(1)
-        sys.exit()
-    else:
+    handler = _USER_CHOICE_HANDLERS.get(choice)
+    if handler is None:
         print("Invalid entry! Please try again.")
         return False
+    return handler()
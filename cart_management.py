@@ -1,9 +1,12 @@
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
 from utils import general
 import time
 
+if TYPE_CHECKING:
+    from products.product_management import Product
 
-def add_to_cart(product: Dict) -> None:
+
+def add_to_cart(product: 'Product') -> None:
     """
     Add a product to the shopping cart and update inventory.
 
@@ -12,51 +15,50 @@ def add_to_cart(product: Dict) -> None:
     Updates the product's stock count in the inventory.
 
     Args:
-        product (Dict): Product dictionary containing at minimum:
-                       - 'id': Unique product identifier
-                       - 'name': Product name for display
-                       - 'price': Product price
+        product (Product): Product with at minimum:
+                       - id: Unique product identifier
+                       - name: Product name for display
+                       - price: Product price
 
     Returns:
-        None: Function performs side effects on global cart and products lists
+        None: Function performs side effects on global cart and products
 
     Note:
         - Assumes product stock validation is handled by calling function
-        - Modifies global state (cart and products lists)
+        - Modifies global state (cart and products)
         - Prints confirmation message to console
     """
-    product_in_inventory: Dict | None = None
-    for p in general.products:
-        if p['id'] == product['id']:
-            product_in_inventory = p
-            break
+    product_id: int = product.id
+    name: str = product.name
+    product_in_inventory: 'Product | None' = general.products_by_id.get(product_id)
 
     if not product_in_inventory:
-        print(f"❌ Product '{product['name']}' not found in inventory")
+        print(f"❌ Product '{name}' not found in inventory")
         return
 
-    if product_in_inventory['stock'] <= 0:
-        print(f"❌ '{product['name']}' is out of stock")
+    stock: int = product_in_inventory.stock
+    if stock <= 0:
+        print(f"❌ '{name}' is out of stock")
         return
 
-    # Find existing cart item and update quantity or add as a new item
-    for item in general.cart:
-        if item['product_id'] == product['id']:
-            item['quantity'] += 1
-            break
+    # Update quantity of the existing cart item or add as a new item
+    cart_item: Dict | None = general.cart.get(product_id)
+    if cart_item:
+        cart_item['quantity'] += 1
     else:
-        general.cart.append({
-            'product_id': product['id'],
+        general.cart[product_id] = {
+            'product_id': product_id,
             'quantity': 1,
-            'name': product['name'],
-            'price': product['price']
-        })
+            'name': name,
+            'price': product.price
+        }
 
     # Update inventory
-    product_in_inventory['stock'] -= 1
+    stock -= 1
+    product_in_inventory.stock = stock
 
-    print(f"✅ Added {product['name']} to cart")
-    print(f"📦 Remaining stock: {product_in_inventory['stock']}")
+    print(f"✅ Added {name} to cart")
+    print(f"📦 Remaining stock: {stock}")
 
 
 def view_cart() -> float:
@@ -83,17 +85,18 @@ def view_cart() -> float:
         print("\nYour cart is empty 🛒")
         return 0.0
 
-    cart_total: float = 0.0
-    print(f"\n{'===' * 8} Your Cart {'===' * 8}")
-
-    for i, item in enumerate(general.cart, 1):
-        product_cost: float = item['price'] * item['quantity']
-        cart_total += product_cost
-        print(f"{i}. {item['name']} x{item['quantity']} - NGN {product_cost:,.2f}")
+    items = general.cart.values()
+    cart_total: float = sum(item['price'] * item['quantity'] for item in items)
 
-    print(f"{'=' * 32}")
-    print(f"Cart Total: NGN {cart_total:,.2f}")
-    print(f"{'=' * 32}")
+    lines = [f"\n{'===' * 8} Your Cart {'===' * 8}"]
+    lines.extend(
+        f"{i}. {item['name']} x{item['quantity']} - NGN {item['price'] * item['quantity']:,.2f}"
+        for i, item in enumerate(items, 1)
+    )
+    lines.append(f"{'=' * 32}")
+    lines.append(f"Cart Total: NGN {cart_total:,.2f}")
+    lines.append(f"{'=' * 32}")
+    print("\n".join(lines))
 
     return cart_total
 
@@ -125,14 +128,11 @@ def update_cart_item(item_id: int, quantity: int) -> bool:
         print("Quantity must be positive")
         return False
 
-    product_id = general.cart[item_id]['product_id']
-    current_quantity = general.cart[item_id]['quantity']
+    cart_item: Dict = list(general.cart.values())[item_id]
+    product_id = cart_item['product_id']
+    current_quantity = cart_item['quantity']
 
-    product: Dict | None = None
-    for p in general.products:
-        if p['id'] == product_id:
-            product = p
-            break
+    product: 'Product | None' = general.products_by_id.get(product_id)
 
     if not product:
         print("Product not found in inventory")
@@ -142,22 +142,31 @@ def update_cart_item(item_id: int, quantity: int) -> bool:
     quantity_diff = quantity - current_quantity
 
     # Check if we have enough stock for the increase
-    if quantity_diff > 0 and product['stock'] < quantity_diff:
-        print(f"Only {product['stock']} additional items available in inventory")
+    stock: int = product.stock
+    if quantity_diff > 0 and stock < quantity_diff:
+        print(f"Only {stock} additional items available in inventory")
         return False
 
     # Update cart quantity
-    general.cart[item_id]['quantity'] = quantity
+    cart_item['quantity'] = quantity
 
     # Update inventory stock
-    product['stock'] -= quantity_diff
+    stock -= quantity_diff
+    product.stock = stock
 
-    print(f"✅ Updated {general.cart[item_id]['name']} quantity to {quantity}")
-    print(f"📦 Remaining stock: {product['stock']}")
+    print(f"✅ Updated {cart_item['name']} quantity to {quantity}")
+    print(f"📦 Remaining stock: {stock}")
 
     return True
 
 
+def _restock(product_id: int, quantity: int) -> None:
+    """Return a quantity of a product to inventory stock"""
+    product: 'Product | None' = general.products_by_id.get(product_id)
+    if product:
+        product.stock += quantity
+
+
 def remove_from_cart(item_index: int) -> bool:
     """
     Remove an item from the shopping cart and restore its quantity to product stock.
@@ -169,14 +178,9 @@ def remove_from_cart(item_index: int) -> bool:
         print("❌ Invalid item number")
         return False
 
-    product_id: int = general.cart[item_index]['product_id']
-
-    for p in general.products:
-        if p['id'] == product_id:
-            p['stock'] += general.cart[item_index]['quantity']
-            break
-
-    del general.cart[item_index]
+    product_id: int = list(general.cart)[item_index]
+    cart_item: Dict = general.cart.pop(product_id)
+    _restock(product_id, cart_item['quantity'])
     return True
 
 
@@ -190,11 +194,8 @@ def clear_cart() -> None:
         print("Cart is already empty 🛒")
         return
 
-    for item in general.cart:
-        for p in general.products:
-            if p['id'] == item['product_id']:
-                p['stock'] += item['quantity']
-                break
+    for product_id, item in general.cart.items():
+        _restock(product_id, item['quantity'])
 
     general.cart.clear()
     print("Cart cleared successfully! 🛒")
@@ -213,10 +214,12 @@ def checkout():
 
     print(f"\nOrder Summary:")
     print(f"Total Amount: NGN {total:,.2f}")
-    print(f"Your Balance: NGN {general.current_user['balance']:,.2f}")
-    print(f"Balance After Purchase: NGN {general.current_user['balance'] - total:,.2f}")
+    user: Dict = general.current_user
+    balance: float = user['balance']
+    print(f"Your Balance: NGN {balance:,.2f}")
+    print(f"Balance After Purchase: NGN {balance - total:,.2f}")
 
-    if total > general.current_user['balance']:
+    if total > balance:
         print("\nInsufficient funds. Please fund your wallet.")
         return
 
@@ -224,7 +227,7 @@ def checkout():
     if confirm == 'y':
         try:
             transaction_id = f"TXN{int(time.time())}"  # Simple transaction ID
-            general.current_user['balance'] -= total
+            user['balance'] = balance - total
             general.save_users()
             general.cart.clear()
             print(f"\n✅ Purchase successful! Transaction ID: {transaction_id}")
@@ -1,11 +1,39 @@
+import glob
+import json
 import os
-from typing import List, Dict, Optional
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import List, Dict, Iterator, Optional
+
+ACCOUNTS_FILE: str = 'data/accounts.json'
+LEGACY_ACCOUNTS_FILE: str = 'data/accounts.txt'
+# The legacy file is renamed once its accounts are in accounts.json
+MIGRATED_ACCOUNTS_FILE: str = 'data/accounts.txt.migrated'
+# Unreadable accounts files are moved to data/accounts.json.corrupt-<unique suffix>
+# so the next save can't overwrite them
+CORRUPT_ACCOUNTS_PREFIX: str = 'accounts.json.corrupt-'
+
+# ANSI erase-display + cursor-home; avoids spawning a shell per clear
+_CLEAR_SCREEN: str = "\x1b[2J\x1b[H"
+_IS_WINDOWS: bool = os.name == 'nt'
+# Longest input accepted by input_number(); far beyond any menu, quantity or item number
+_MAX_NUMBER_DIGITS: int = 9
 
 # Global variables
 users: List = []
+users_by_username: Dict[str, Dict] = {}
+users_by_email: Dict[str, Dict] = {}
 current_user: Optional[Dict] = None
-cart: List[Dict] = []
-products: List[Dict] = []
+cart: Dict[int, Dict] = {}
+products: List = []
+products_by_id: Dict = {}
+
+# Deferred save state, see batched_saves()
+_batch_depth: int = 0
+_users_dirty: bool = False
+# Set when accounts.json could not be read or moved aside; blocks saving
+_accounts_file_locked: bool = False
 
 
 def ensure_data_directory():
@@ -16,28 +44,85 @@ def ensure_data_directory():
 
 def load_users() -> None:
     """
-    Load user accounts from data/accounts.txt file.
+    Load user accounts from data/accounts.json file.
+
+    The file holds a JSON list of {username, email, password_hash, balance}
+    objects. If it doesn't exist and no unreadable copy has been moved
+    aside, accounts are migrated from the legacy data/accounts.txt CSV file.
+    Skips malformed entries and rebuilds the username and email indexes.
+
+    A file that can't be read or parsed is moved to a uniquely named
+    data/accounts.json.corrupt-* file so that saving the (empty) users list
+    doesn't wipe it. If it can't be moved either, saving is refused.
+    """
+    global users, users_by_username, users_by_email, _accounts_file_locked
+    records: List = []
+    _accounts_file_locked = False
+    try:
+        with open(ACCOUNTS_FILE, 'r') as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError("expected a list of accounts")
+    except FileNotFoundError:
+        corrupt_files: List[str] = glob.glob(os.path.join('data', CORRUPT_ACCOUNTS_PREFIX + '*'))
+        if corrupt_files:
+            # The legacy file predates whatever was lost; don't bring it back
+            print(f"No readable accounts file, unreadable copies kept in: {', '.join(sorted(corrupt_files))}")
+        else:
+            records = _read_legacy_users()
+    except (OSError, ValueError) as e:
+        print(f"Could not load users: {e}")
+        records = []
+        _move_aside_accounts_file()
+
+    users = [user for user in records if _is_valid_user(user)]
+    users_by_username = {u['username']: u for u in users}
+    users_by_email = {u['email']: u for u in users}
+
+
+def _move_aside_accounts_file() -> None:
+    """Move an unreadable accounts.json out of the way, or block saving if that fails"""
+    global _accounts_file_locked
+    try:
+        fd, corrupt_path = tempfile.mkstemp(dir='data', prefix=CORRUPT_ACCOUNTS_PREFIX)
+        os.close(fd)
+        try:
+            os.replace(ACCOUNTS_FILE, corrupt_path)
+        except OSError:
+            os.remove(corrupt_path)
+            raise
+        print(f"Moved the unreadable accounts file to {corrupt_path}")
+    except OSError as e:
+        _accounts_file_locked = True
+        print(f"Could not move the accounts file aside, changes will not be saved: {e}")
+
+
+def _is_valid_user(user) -> bool:
+    """Check that a loaded account record has every field and a non-negative balance"""
+    if not isinstance(user, dict):
+        return False
+    balance = user.get('balance')
+    return (bool(user.get('username')) and bool(user.get('email')) and bool(user.get('password_hash'))
+            and isinstance(balance, (int, float)) and balance >= 0)
+
+
+def _read_legacy_users() -> List[Dict]:
+    """
+    Read accounts from the legacy data/accounts.txt file.
 
     Reads CSV format: username,email,password_hash,balance
-    Skips empty lines and malformed entries. Creates empty users list
-    if file doesn't exist.
+    Skips empty lines and malformed entries.
     """
-    global users
-    users = []
+    records: List[Dict] = []
     try:
-        with open('data/accounts.txt', 'r') as f:
+        with open(LEGACY_ACCOUNTS_FILE, 'r') as f:
             for line in f:
                 line = line.strip()
                 if not line:
                     continue
                 try:
                     username, email, password_hash, balance = line.split(',')
-                    if not username.strip() or not email.strip() or not password_hash.strip():
-                        continue
-                    balance_float = float(balance.strip())
-                    if balance_float < 0:
-                        continue
-                    users.append({
+                    records.append({
                         'username': username.strip(),
                         'email': email.strip(),
                         'password_hash': password_hash.strip(),
@@ -47,17 +132,113 @@ def load_users() -> None:
                     continue
     except (FileNotFoundError, PermissionError) as e:
         print(f"Could not load users: {e}")
+    return records
+
+
+def add_user(user: Dict) -> None:
+    """Add a user to the users list and its lookup indexes"""
+    users.append(user)
+    users_by_username[user['username']] = user
+    users_by_email[user['email']] = user
+
+
+def remove_user(user: Dict) -> None:
+    """Remove a user from the users list and its lookup indexes"""
+    users.remove(user)
+    users_by_username.pop(user['username'], None)
+    users_by_email.pop(user['email'], None)
 
 
 def save_users():
-    """Save users to accounts.txt"""
+    """
+    Save users to accounts.json.
+
+    Inside a batched_saves() block the write is deferred until the
+    outermost block exits.
+    """
+    global _users_dirty
+    if _batch_depth:
+        _users_dirty = True
+        return
+    _write_users()
+
+
+@contextmanager
+def batched_saves() -> Iterator[None]:
+    """
+    Collapse every save_users() call made inside the block into one write.
+
+    The pending write happens when the outermost block exits, even if it
+    exits with an exception, so in-memory changes are not lost. A failed
+    write is reported rather than raised, since the block's callers have
+    already told the user about each change.
+    """
+    global _batch_depth, _users_dirty
+    _batch_depth += 1
+    try:
+        yield
+    finally:
+        _batch_depth -= 1
+        if not _batch_depth and _users_dirty:
+            _users_dirty = False
+            try:
+                _write_users()
+            except OSError as e:
+                print(f"Error saving account changes: {e}")
+
+
+def _write_users() -> None:
+    """
+    Write all users to accounts.json.
+
+    The JSON goes to a temporary file in data/ that then replaces
+    accounts.json, so a crash mid-write never leaves a truncated file. After
+    the first successful write the legacy accounts.txt is renamed, so it is
+    never migrated again. Raises OSError if the write fails or the accounts
+    file could not be loaded.
+    """
+    if _accounts_file_locked:
+        raise OSError(f"{ACCOUNTS_FILE} could not be loaded, refusing to overwrite it")
     ensure_data_directory()
-    with open('data/accounts.txt', 'w') as f:
-        for user in users:
-            line = f"{user['username']},{user['email']},{user['password_hash']},{user['balance']}\n"
-            f.write(line)
+    content = json.dumps(users)
+    fd, temp_path = tempfile.mkstemp(dir='data', prefix='accounts.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, ACCOUNTS_FILE)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if os.path.exists(LEGACY_ACCOUNTS_FILE):
+        try:
+            os.replace(LEGACY_ACCOUNTS_FILE, MIGRATED_ACCOUNTS_FILE)
+        except OSError as e:
+            print(f"Could not rename {LEGACY_ACCOUNTS_FILE}: {e}")
+
+
+def input_number(prompt: str) -> Optional[int]:
+    """
+    Prompt for a non-negative whole number.
+
+    Returns None instead of raising when the input is not made of decimal
+    digits or is longer than 9 digits, so callers don't use exceptions for
+    routine typos. The length cap keeps int() clear of its digit limit, so
+    this never raises on typed input.
+    """
+    raw = input(prompt).strip()
+    return int(raw) if raw.isdecimal() and len(raw) <= _MAX_NUMBER_DIGITS else None
 
 
 def clear_screen():
     """Clear the console screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if _IS_WINDOWS:
+        os.system('cls')
+    else:
+        sys.stdout.write(_CLEAR_SCREEN)
+        sys.stdout.flush()
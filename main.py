@@ -10,10 +10,10 @@ def main() -> None:
     general.load_users()
     load_products()
 
+    general.clear_screen()
     print("Welcome to the E-Commerce App! 💳")
 
     while True:
-        general.clear_screen()
         print("\n Sign In / Sign Up\n")
         print("1. Sign In")
         print("2. Sign Up")
@@ -22,6 +22,8 @@ def main() -> None:
             "Do you wish to Sign In or Sign Up? Enter [1-3]\n[To exit, enter 'quit'/'exit']: ").strip().lower()
         if handle_user_choice(user_choice) and general.current_user:
             dashboard()
+            # Clear only when leaving the dashboard, so sign-in errors stay visible
+            general.clear_screen()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,62 @@
-from typing import List, Dict
+from typing import List, Dict, Set, Tuple
 from utils import general
 from cart.cart_management import add_to_cart
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+_MAX_READ_WORKERS: int = 32
+_RESULTS_PAGE_SIZE: int = 50
+
+
+class Product:
+    """An inventory item; slotted so large catalogs stay compact"""
+    __slots__ = ('id', 'name', 'price', 'stock')
+
+    def __init__(self, product_id: int, name: str, price: float, stock: int):
+        self.id = product_id
+        self.name = name
+        self.price = price
+        self.stock = stock
+
+
+# Product search index, rebuilt by load_products(): distinct lowercased names,
+# the general.products indexes carrying each name, and trigram -> positions
+# in _search_names
+_search_names: List[str] = []
+_search_name_products: List[List[int]] = []
+_trigram_index: Dict[str, Set[int]] = {}
+# Positions in _search_names matching each lowercased search term
+_term_matches: Dict[str, List[int]] = {}
+_TERM_CACHE_SIZE: int = 256
+
+
+def _load_warehouse_file(file_path: str) -> List[Tuple[str, float]]:
+    """
+    Read and parse one warehouse file into (name, price) pairs in file order.
+
+    Returns an empty list if the file has disappeared. Entries without
+    exactly one ':' or with a non-numeric price are skipped.
+    """
+    try:
+        with open(file_path, 'r') as f:
+            content = f.read().strip()
+    except FileNotFoundError:
+        return []
+
+    entries: List[Tuple[str, float]] = []
+    append_entry = entries.append
+    for item in content.split(';'):
+        name, sep, price = item.partition(':')
+        if not sep or ':' in price:
+            continue
+        try:
+            price_value = float(price.strip())
+        except ValueError:
+            continue
+        append_entry((name.strip(), price_value))
+    return entries
 
 
 def load_products() -> None:
@@ -10,45 +65,106 @@ def load_products() -> None:
 
     File format: name1:price1;name2:price2;...
     Assigns sequential IDs and default stock of 10 to each product.
-    Skips empty files and malformed entries.
+    Skips empty files and malformed entries. Rebuilds the product ID index
+    and the search index.
     """
     from utils.general import ensure_data_directory
 
-    general.products = []
     ensure_data_directory()
 
-    # Find all warehouse files
-    warehouse_files = []
-    for file in os.listdir('data'):
-        if file.startswith('warehouse') and file.endswith('.txt'):
-            warehouse_files.append(os.path.join('data', file))
+    # Find all warehouse files, sorted so product IDs are stable across runs
+    with os.scandir('data') as entries:
+        warehouse_files: List[str] = sorted(
+            entry.path for entry in entries
+            if entry.name.startswith('warehouse') and entry.name.endswith('.txt')
+        )
 
-    # Load products from each file
-    product_id = 1
-    for file_path in warehouse_files:
-        try:
-            with open(file_path, 'r') as f:
-                content = f.read().strip()
-                if not content:
-                    continue
+    # Read and parse the files concurrently; map() keeps the sorted file order
+    parsed_files: List[List[Tuple[str, float]]] = []
+    if warehouse_files:
+        with ThreadPoolExecutor(max_workers=min(_MAX_READ_WORKERS, len(warehouse_files))) as executor:
+            parsed_files = list(executor.map(_load_warehouse_file, warehouse_files))
+
+    # Assign IDs once everything is parsed, so they only depend on file order
+    products: List[Product] = [
+        Product(product_id, name, price, 10)  # Default stock 10
+        for product_id, (name, price) in enumerate(chain.from_iterable(parsed_files), 1)
+    ]
+
+    general.products = products
+    general.products_by_id = {p.id: p for p in products}
+    _build_search_index([p.name.lower() for p in products])
 
-                items = content.split(';')
-                for item in items:
-                    if not item:
-                        continue
-                    try:
-                        name, price = item.split(':')
-                        general.products.append({
-                            'id': product_id,
-                            'name': name.strip(),
-                            'price': float(price.strip()),
-                            'stock': 10  # Default stock
-                        })
-                        product_id += 1
-                    except ValueError:
-                        continue
-        except FileNotFoundError:
-            continue
+
+def _trigrams(text: str) -> Set[str]:
+    """Return the set of 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _build_search_index(names: List[str]) -> None:
+    """
+    Rebuild the search index from lowercased product names (parallel to general.products).
+
+    Warehouses list the same products many times, so the index is built over
+    the distinct names (a few thousand instead of ~92k products), each with
+    a trigram posting set and the product indexes that carry that name.
+    """
+    position_by_name: Dict[str, int] = {}
+    _search_names.clear()
+    _search_name_products.clear()
+    _trigram_index.clear()
+    _term_matches.clear()
+
+    for product_index, name in enumerate(names):
+        position: int | None = position_by_name.get(name)
+        if position is None:
+            position = len(_search_names)
+            position_by_name[name] = position
+            _search_names.append(name)
+            _search_name_products.append([])
+            for trigram in _trigrams(name):
+                postings: Set[int] | None = _trigram_index.get(trigram)
+                if postings is None:
+                    _trigram_index[trigram] = {position}
+                else:
+                    postings.add(position)
+        _search_name_products[position].append(product_index)
+
+
+def _match_term(term: str) -> List[int]:
+    """
+    Return the positions in _search_names of names containing a lowercased term.
+
+    Terms of 3+ characters only check the names that hold every trigram of
+    the term. Shorter terms scan the names, reusing the smallest cached
+    match list among the term's substrings (e.g. "ri" filters the matches
+    of "r"). Results are cached per term.
+    """
+    matches: List[int] | None = _term_matches.get(term)
+    if matches is not None:
+        return matches
+
+    names: List[str] = _search_names
+    if len(term) >= 3:
+        postings: List[Set[int]] = sorted(
+            (_trigram_index.get(trigram, set()) for trigram in _trigrams(term)), key=len
+        )
+        candidates = set.intersection(*postings)
+        matches = [i for i in sorted(candidates) if term in names[i]]
+    else:
+        cached_candidates: List[int] | None = None
+        for cached_term, cached_matches in _term_matches.items():
+            if (cached_candidates is None or len(cached_matches) < len(cached_candidates)) and cached_term in term:
+                cached_candidates = cached_matches
+        if cached_candidates is None:
+            matches = [i for i, name in enumerate(names) if term in name]
+        else:
+            matches = [i for i in cached_candidates if term in names[i]]
+
+    if len(_term_matches) >= _TERM_CACHE_SIZE:
+        _term_matches.clear()
+    _term_matches[term] = matches
+    return matches
 
 
 def search_products():
@@ -60,19 +176,20 @@ def search_products():
     If multiple search terms are provided, matches products containing ANY of the terms.
 
     Returns:
-        List[Dict]: List of matching product dictionaries. Each product contains:
-                   - 'id': Unique product identifier
-                   - 'name': Product name
-                   - 'price': Product price
-                   - 'stock': Available stock quantity
+        List[Product]: The displayed matching products (at most the first 50),
+                   so item numbers map to what the user saw. Each product has:
+                   - id: Unique product identifier
+                   - name: Product name
+                   - price: Product price
+                   - stock: Available stock quantity
                    Returns empty list if no matches found or invalid input.
 
     Global Variables:
-        products (List[Dict]): Global inventory list that gets searched
+        products (List[Product]): Global inventory list that gets searched
 
     Note:
         - Performs partial string matching (case-insensitive)
-        - Displays formatted search results to console
+        - Displays the first 50 formatted search results to console
         - Handles empty input gracefully
         - Avoids duplicate results when multiple terms match same product
     """
@@ -81,26 +198,31 @@ def search_products():
         print("Please enter a search term")
         return []
 
-    search_terms: List[str] = query.split()
-    results = []
-
-    for product in general.products:
-        for term in search_terms:
-            if term.lower() in product['name'].lower():
-                results.append(product)
-
-    if not results:
+    # Lowercased, with repeats dropped ("milk milk" is searched once)
+    search_terms: Tuple[str, ...] = tuple(dict.fromkeys(term.lower() for term in query.split()))
+    positions: Set[int] = {position for term in search_terms for position in _match_term(term)}
+    name_products: List[List[int]] = _search_name_products
+    indexes: List[int] = sorted(i for position in positions for i in name_products[position])
+    if not indexes:
         print("\nNo matching items found")
         return []
 
-    print("\n=== Search Results ===")
-    for i, product in enumerate(results, 1):
-        print(f"{i}. {product['name']} - NGN {product['price']:,.2f} ({product['stock']} available)")
+    products: List[Product] = general.products
+    page: List[Product] = [products[i] for i in indexes[:_RESULTS_PAGE_SIZE]]
+    lines: List[str] = ["\n=== Search Results ==="]
+    lines.extend(
+        f"{i}. {product.name} - NGN {product.price:,.2f} ({product.stock} available)"
+        for i, product in enumerate(page, 1)
+    )
+    if len(indexes) > _RESULTS_PAGE_SIZE:
+        lines.append(f"... showing first {_RESULTS_PAGE_SIZE} of {len(indexes)} matches, "
+                     "refine your search to narrow them")
+    sys.stdout.write("\n".join(lines) + "\n")
 
-    return results
+    return page
 
 
-def handle_search_results(results: list[dict]) -> None:
+def handle_search_results(results: List[Product]) -> None:
     """
     Handle user interactions with search results.
 
@@ -110,8 +232,7 @@ def handle_search_results(results: list[dict]) -> None:
     3. Return to the purchase menu
 
     Args:
-        results (list[dict]): List of product dictionaries from search results.
-                            Each product should contain 'id', 'name', 'price', and 'stock' keys.
+        results (List[Product]): List of products from search results.
 
     Returns:
         None
@@ -129,18 +250,19 @@ def handle_search_results(results: list[dict]) -> None:
         choice: str = input("Enter choice (1-3): ").strip()
 
         if choice == "1":
-            try:
-                selection: int = int(input("Enter item number to add: ")) - 1
-                if 0 <= selection < len(results):
-                    product = results[selection]
-                    if product['stock'] <= 0:
-                        print("❌ Item out of stock")
-                        continue
-                    add_to_cart(product)
-                else:
-                    print("💢 Invalid item number!")
-            except ValueError:
+            item_number: int | None = general.input_number("Enter item number to add: ")
+            if item_number is None:
                 print("Invalid input")
+                continue
+            selection: int = item_number - 1
+            if 0 <= selection < len(results):
+                product = results[selection]
+                if product.stock <= 0:
+                    print("❌ Item out of stock")
+                    continue
+                add_to_cart(product)
+            else:
+                print("💢 Invalid item number!")
         elif choice == "2":
             results = search_products()
             if not results:
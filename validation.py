@@ -1,20 +1,30 @@
 import re
+import string
+from functools import lru_cache
 
 EMAIL_VALIDATE_PATTERN: str = r"^\S+@\S+\.\S+$"
-PASSWORD_VALIDATE_PATTERN: str = r"^(?=.*?[A-Z])(?=.*?[a-z])(?=.*?[0-9])(?=.*?[#?!@$%^&*-]).{16,}$"
+PASSWORD_MIN_LENGTH: int = 16
+PASSWORD_MAX_BYTES: int = 72  # bcrypt rejects longer passwords
 
+_EMAIL_RE = re.compile(EMAIL_VALIDATE_PATTERN)
+_PASSWORD_CHAR_CLASSES = (
+    frozenset(string.ascii_uppercase),
+    frozenset(string.ascii_lowercase),
+    frozenset(string.digits),
+    frozenset("#?!@$%^&*-"),
+)
 
+
+@lru_cache(maxsize=1024)
 def validate_email(mail: str) -> bool:
-    if re.match(EMAIL_VALIDATE_PATTERN, mail):
-        return True
-    else:
-        return False
+    return _EMAIL_RE.match(mail) is not None
 
 
 def validate_password(password: str) -> bool:
     """
-    Regex pattern for a strong password:
+    Rules for a strong password:
     - At least 16 characters long
+    - At most 72 bytes once UTF-8 encoded (the bcrypt limit)
     - Contains at least one uppercase letter
     - Contains at least one lowercase letter
     - Contains at least one digit
@@ -22,7 +32,7 @@ def validate_password(password: str) -> bool:
     :param password:
     :return: bool
     """
-    if re.match(PASSWORD_VALIDATE_PATTERN, password):
-        return True
-    else:
+    if len(password) < PASSWORD_MIN_LENGTH or len(password.encode()) > PASSWORD_MAX_BYTES:
         return False
+    chars = set(password)
+    return all(not chars.isdisjoint(char_class) for char_class in _PASSWORD_CHAR_CLASSES)